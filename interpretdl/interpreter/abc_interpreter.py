@@ -1,12 +1,9 @@
-import abc
-import sys
 import numpy as np
 import warnings
 
-from ..common.python_utils import versiontuple2tuple
+from abc import ABC
 
-# Ensure compatibility with Python 2/3
-ABC = abc.ABC if sys.version_info >= (3, 4) else abc.ABCMeta(str('ABC'), (), {})
+from ..common.python_utils import versiontuple2tuple
 
 
 class Interpreter(ABC):
@@ -44,6 +41,7 @@ class Interpreter(ABC):
         self.device = device
         self.paddle_model = paddle_model
         self.predict_fn = None
+        self._prepared = False
 
         if use_cuda in [True, False]:
             warnings.warn('``use_cuda`` would be deprecated soon. Use ``device`` directly.', stacklevel=2)
@@ -77,6 +75,10 @@ class Interpreter(ABC):
         #######################################################################
         # This is a simple implementation for disabling gradient computation. #
         #######################################################################
+        if self._prepared:
+            # device and model mode are already set; avoid the state churn on rebuilds.
+            return
+
         import paddle
         if not paddle.is_compiled_with_cuda() and self.device[:3] == 'gpu':
             print("Paddle is not installed with GPU support. Change to CPU version now.")
@@ -87,6 +89,7 @@ class Interpreter(ABC):
 
         # does not need gradients at all.
         self.paddle_model.eval()
+        self._prepared = True
 
 
 class InputGradientInterpreter(Interpreter):
@@ -111,39 +114,57 @@ class InputGradientInterpreter(Interpreter):
         assert hasattr(paddle_model, 'forward'), \
             "paddle_model has to be " \
             "an instance of paddle.nn.Layer or a compatible one."
+        self.predict_fn_batched = None
+        self._mutated_layers = None
 
     def _paddle_env_setup(self):
-        """Prepare the environment setup. 
+        """Prepare the environment setup.
         This function is an implementation for gradient computation.
         """
         import paddle
-        if not paddle.is_compiled_with_cuda() and self.device[:3] == 'gpu':
-            print("Paddle is not installed with GPU support. Change to CPU version now.")
-            self.device = 'cpu'
+        if not self._prepared:
+            if not paddle.is_compiled_with_cuda() and self.device[:3] == 'gpu':
+                print("Paddle is not installed with GPU support. Change to CPU version now.")
+                self.device = 'cpu'
+
+            # globally set device.
+            paddle.set_device(self.device)
 
-        # globally set device.
-        paddle.set_device(self.device)
         if versiontuple2tuple(paddle.__version__) >= (2, 2, 1):
             # From Paddle2.2.1, gradients are supported in eval mode.
-            self.paddle_model.eval()
+            if not self._prepared:
+                self.paddle_model.eval()
         else:
-            # Former versions.
+            # Former versions. Walk the sublayers only once; later rebuilds re-toggle the cached
+            # BatchNorm/Dropout modules without the O(#layers) traversal.
             self.paddle_model.train()
-            for n, v in self.paddle_model.named_sublayers():
+            # getattr: subclasses may not chain through InputGradientInterpreter.__init__
+            # (e.g. GAInterpreter calls Interpreter.__init__ directly).
+            if getattr(self, '_mutated_layers', None) is None:
+                self._mutated_layers = [
+                    v for n, v in self.paddle_model.named_sublayers()
+                    if "batchnorm" in v.__class__.__name__.lower() or "dropout" in v.__class__.__name__.lower()
+                ]
+            for v in self._mutated_layers:
                 if "batchnorm" in v.__class__.__name__.lower():
                     v._use_global_stats = True
                 if "dropout" in v.__class__.__name__.lower():
                     v.p = 0
+        self._prepared = True
 
-    def _build_predict_fn(self, rebuild: bool = False, gradient_of: str = 'probability'):
+    def _build_predict_fn(self, rebuild: bool = False, gradient_of: str = 'loss', amp: bool = False):
         """Build ``predict_fn`` for input gradients based algorithms.
         The model is supposed to be a classification model.
 
         Args:
             rebuild (bool, optional): forces to rebuild. Defaults to ``False``.
-            gradient_of (str, optional): computes the gradient of 
-                [``"loss"``, ``"logit"`` or ``"probability"``] *w.r.t.* input data. Defaults to ``"probability"``. 
-                Other options can get similar results while the absolute scale might be different.
+            gradient_of (str, optional): computes the gradient of
+                [``"loss"``, ``"logit"`` or ``"probability"``] *w.r.t.* input data. Defaults to ``"loss"``, which
+                uses the fused cross-entropy kernel and is the preferred choice. The other options are kept for
+                compatibility; they get similar results while the absolute scale might be different.
+            amp (bool, optional): runs the model forward (and its backward) under bfloat16 autocast, halving
+                the memory bandwidth on GPUs that support it. The loss is computed in float32. Defaults to
+                ``False``.
         """
 
         if self.predict_fn is not None:
@@ -155,13 +176,15 @@ class InputGradientInterpreter(Interpreter):
 
             self._paddle_env_setup()
 
-            def predict_fn(data, labels=None):
+            def predict_fn(data, labels=None, return_tensor=False):
                 """predict_fn for input gradients based interpreters,
                     for image classification models only.
 
                 Args:
                     data ([type]): scaled input data.
                     labels ([type]): can be None.
+                    return_tensor (bool): returns gradients as a paddle.Tensor (on the device), so that callers
+                        can keep reducing on the device and transfer the final result only.
 
                 Returns:
                     [type]: gradients, labels
@@ -169,43 +192,135 @@ class InputGradientInterpreter(Interpreter):
                 import paddle
                 assert len(data.shape) == 4  # [bs, h, w, 3]
                 assert labels is None or \
-                    (isinstance(labels, (list, np.ndarray)) and len(labels) == data.shape[0])
+                    (isinstance(labels, (list, np.ndarray, paddle.Tensor)) and len(labels) == data.shape[0])
 
-                data = paddle.to_tensor(data)
+                if not isinstance(data, paddle.Tensor):
+                    data = paddle.to_tensor(data)
                 data.stop_gradient = False
 
                 # get logits, [bs, num_c]
-                logits = self.paddle_model(data)
-                num_samples, num_classes = logits.shape[0], logits.shape[1]
+                if amp:
+                    # only construct the context when requested: the dtype kwarg of auto_cast
+                    # requires Paddle 2.4+.
+                    with paddle.amp.auto_cast(level='O1', dtype='bfloat16'):
+                        logits = self.paddle_model(data)
+                    logits = logits.astype('float32')
+                else:
+                    logits = self.paddle_model(data)
+                num_samples = logits.shape[0]
 
-                # get predictions.
-                pred = paddle.argmax(logits, axis=1)
+                # get predictions, only when labels are not provided. argmax on logits equals argmax on
+                # probabilities since softmax is monotonic.
                 if labels is None:
-                    labels = pred.numpy()
+                    labels = paddle.argmax(logits, axis=1).numpy()
 
                 # get gradients
+                # fast path: labels that are already an int64 tensor on the device skip the conversion.
+                if isinstance(labels, paddle.Tensor):
+                    labels_t = labels
+                else:
+                    labels_t = paddle.to_tensor(np.array(labels).reshape((num_samples, )).astype('int64'))
+
                 if gradient_of == 'loss':
-                    # cross-entropy loss
-                    loss = paddle.nn.functional.cross_entropy(logits, paddle.to_tensor(labels), reduction='sum')
+                    # fused cross-entropy (softmax + nll) kernel.
+                    loss = paddle.nn.functional.cross_entropy(logits, labels_t, reduction='sum')
                 else:
-                    # logits or probas
-                    labels = np.array(labels).reshape((num_samples, ))
-                    labels_onehot = paddle.nn.functional.one_hot(paddle.to_tensor(labels), num_classes=num_classes)
+                    # logits or probas. index_sample picks the target class directly, instead of the
+                    # one_hot + multiply + sum chain.
+                    labels_t = labels_t.unsqueeze(1)
                     if gradient_of == 'logit':
-                        loss = paddle.sum(logits * labels_onehot, axis=1)
+                        loss = paddle.index_sample(logits, labels_t).squeeze(1)
                     else:
                         probas = paddle.nn.functional.softmax(logits, axis=1)
-                        loss = paddle.sum(probas * labels_onehot, axis=1)
+                        loss = paddle.index_sample(probas, labels_t).squeeze(1)
 
-                loss.backward()
-                gradients = data.grad
-                if isinstance(gradients, paddle.Tensor):
+                # paddle.grad returns a fresh tensor without touching the persistent .grad accumulator,
+                # skipping the bookkeeping (and extra allocation) that .backward() would do.
+                gradients = paddle.grad(outputs=[loss], inputs=[data])[0]
+                if not return_tensor and isinstance(gradients, paddle.Tensor):
                     gradients = gradients.numpy()
 
                 return gradients, labels
 
             self.predict_fn = predict_fn
 
+    def _build_batched_predict_fn(self,
+                                  rebuild: bool = False,
+                                  gradient_of: str = 'loss',
+                                  amp: bool = False,
+                                  to_static: bool = False):
+        """Build :py:attr:`predict_fn_batched` for algorithms that aggregate input gradients over many
+        replicas of the same inputs (SmoothGrad, IntGrad, GradShap). The replicas are stacked along the
+        batch dimension and evaluated with one forward/backward pass, amortizing the per-call overhead
+        over ``n_reps``.
+
+        Args:
+            rebuild (bool, optional): forces to rebuild. Defaults to ``False``.
+            gradient_of (str, optional): see :py:meth:`_build_predict_fn`. Defaults to ``"loss"``.
+            amp (bool, optional): see :py:meth:`_build_predict_fn`. Defaults to ``False``.
+            to_static (bool, optional): compiles the forward + cross-entropy + backward sequence into one
+                static graph via :py:func:`paddle.jit.to_static`, so the executor can fuse the pointwise
+                ops and skip the Python dispatch. Only effective with ``gradient_of='loss'``; models that
+                cannot be converted fall back to the dygraph path. Defaults to ``False``.
+        """
+
+        if self.predict_fn_batched is None or rebuild:
+            self._build_predict_fn(rebuild=rebuild, gradient_of=gradient_of, amp=amp)
+
+            import paddle
+
+            static_grad_fn = None
+            if to_static and gradient_of == 'loss':
+                # to_static caches one trace per input spec, so repeated calls with the same batch size
+                # do not re-trace.
+
+                def _grad_fn(data, labels_t):
+                    data.stop_gradient = False
+                    if amp:
+                        # only construct the context when requested: the dtype kwarg of auto_cast
+                        # requires Paddle 2.4+.
+                        with paddle.amp.auto_cast(level='O1', dtype='bfloat16'):
+                            logits = self.paddle_model(data)
+                        logits = logits.astype('float32')
+                    else:
+                        logits = self.paddle_model(data)
+                    loss = paddle.nn.functional.cross_entropy(logits, labels_t, reduction='sum')
+                    return paddle.grad(outputs=[loss], inputs=[data])[0]
+
+                static_grad_fn = paddle.jit.to_static(_grad_fn)
+
+            def predict_fn_batched(data, labels, n_reps):
+                """predict_fn for n-sample aggregation, for image classification models only.
+
+                Args:
+                    data ([type]): ``n_reps`` stacked replicas of the scaled input data,
+                        of shape ``(n_reps * bsz, ...)``.
+                    labels ([type]): ``bsz`` labels, shared by all replicas.
+                    n_reps (int): the number of stacked replicas.
+
+                Returns:
+                    [type]: gradients *w.r.t.* ``data``, as a paddle.Tensor of shape ``(n_reps * bsz, ...)``.
+                """
+                nonlocal static_grad_fn
+                labels = np.tile(np.array(labels).reshape((-1, )), n_reps)
+                if static_grad_fn is not None:
+                    try:
+                        if not isinstance(data, paddle.Tensor):
+                            data = paddle.to_tensor(data)
+                        labels_t = paddle.to_tensor(labels.astype('int64'))
+                        return static_grad_fn(data, labels_t)
+                    except Exception as e:
+                        # not every model survives dygraph-to-static conversion; stay in dygraph then,
+                        # but tell the user they are not getting the compiled path they asked for.
+                        warnings.warn(
+                            f"to_static compilation of predict_fn_batched failed ({e!r}). "
+                            "Falling back to the dygraph path.", stacklevel=2)
+                        static_grad_fn = None
+                gradients, _ = self.predict_fn(data, labels, return_tensor=True)
+                return gradients
+
+            self.predict_fn_batched = predict_fn_batched
+
 
 class InputOutputInterpreter(Interpreter):
     """This is one of the sub-abstract Interpreters. 
@@ -264,17 +379,19 @@ class InputOutputInterpreter(Interpreter):
                 import paddle
                 assert len(data.shape) == 4  # [bs, h, w, 3]
 
-                with paddle.no_grad():
+                # inference_mode (Paddle 2.5+) skips the autograd bookkeeping that no_grad still does.
+                no_grad = getattr(paddle, 'inference_mode', paddle.no_grad)
+                with no_grad():
                     logits = self.paddle_model(paddle.to_tensor(data))  # get logits, [bs, num_c]
-                    probas = paddle.nn.functional.softmax(logits, axis=1)  # get probabilities.
-                    pred = paddle.argmax(probas, axis=1)  # get predictions.
 
                     if label is None:
-                        label = pred.numpy()  # label is an integer.
+                        # argmax on logits equals argmax on probabilities, softmax being monotonic.
+                        label = paddle.argmax(logits, axis=1).numpy()  # label is an integer.
 
                     if output == 'logit':
                         return logits.numpy(), label
                     else:
+                        probas = paddle.nn.functional.softmax(logits, axis=1)  # get probabilities.
                         return probas.numpy(), label
 
             self.predict_fn = predict_fn
@@ -305,6 +422,14 @@ class IntermediateLayerInterpreter(Interpreter):
         assert hasattr(paddle_model, 'forward'), \
             "paddle_model has to be " \
             "an instance of paddle.nn.Layer or a compatible one."
+        self._hooks = []
+
+    def close(self):
+        """Remove the forward hooks registered on the target layers. Call this when the interpreter is no
+        longer needed, to leave ``paddle_model`` unhooked."""
+        for h in self._hooks:
+            h.remove()
+        self._hooks = []
 
     def _build_predict_fn(self, rebuild: bool = False, target_layer: str = None, target_layer_pattern: str = None):
         """Build :py:attr:`predict_fn` for IntermediateLayer based algorithms.
@@ -330,44 +455,54 @@ class IntermediateLayerInterpreter(Interpreter):
 
             self._paddle_env_setup()
 
-            def predict_fn(data):
-                import paddle
-                import re
+            import paddle
+            import re
 
-                def target_layer_pattern_match(layer_name):
-                    return re.match(target_layer_pattern, layer_name)
+            def target_layer_pattern_match(layer_name):
+                return re.match(target_layer_pattern, layer_name)
 
-                def target_layer_match(layer_name):
-                    return layer_name == target_layer
+            def target_layer_match(layer_name):
+                return layer_name == target_layer
 
-                match_func = target_layer_match if target_layer is not None else target_layer_pattern_match
+            match_func = target_layer_match if target_layer is not None else target_layer_pattern_match
 
-                target_feature_maps = []
+            target_feature_maps = []
+            collecting = [False]  # a list, so the hook closure sees predict_fn's toggles.
 
-                def hook(layer, input, output):
+            def hook(layer, input, output):
+                # no-op unless predict_fn is collecting, so the persistently registered hooks do not
+                # tax other forwards of the same model (e.g. continued training).
+                if collecting[0]:
                     target_feature_maps.append(output.numpy())
 
-                hooks = []
-                for name, v in self.paddle_model.named_sublayers():
-                    if match_func(name):
-                        h = v.register_forward_post_hook(hook)
-                        hooks.append(h)
+            # search the sublayers and register the hooks once; predict_fn only clears the collected
+            # features between calls. close() removes the hooks.
+            self.close()
+            for name, v in self.paddle_model.named_sublayers():
+                if match_func(name):
+                    h = v.register_forward_post_hook(hook)
+                    self._hooks.append(h)
 
-                assert len(hooks) > 0, f"No target layers are found in the given model, \
-                                the list of layer names are \n \
-                                {[n for n, v in self.paddle_model.named_sublayers()]}"
+            assert len(self._hooks) > 0, f"No target layers are found in the given model, \
+                            the list of layer names are \n \
+                            {[n for n, v in self.paddle_model.named_sublayers()]}"
 
-                with paddle.no_grad():
-                    data = paddle.to_tensor(data)
-                    logits = self.paddle_model(data)
+            def predict_fn(data):
+                target_feature_maps.clear()
 
-                    # hooks has to be removed.
-                    for h in hooks:
-                        h.remove()
+                # inference_mode (Paddle 2.5+) skips the autograd bookkeeping that no_grad still does.
+                no_grad = getattr(paddle, 'inference_mode', paddle.no_grad)
+                with no_grad():
+                    data = paddle.to_tensor(data)
+                    collecting[0] = True
+                    try:
+                        logits = self.paddle_model(data)
+                    finally:
+                        collecting[0] = False
 
                     probas = paddle.nn.functional.softmax(logits, axis=1)
                     predict_label = paddle.argmax(probas, axis=1)  # get predictions.
 
-                return target_feature_maps, probas.numpy(), predict_label.numpy()
+                return list(target_feature_maps), probas.numpy(), predict_label.numpy()
 
             self.predict_fn = predict_fn
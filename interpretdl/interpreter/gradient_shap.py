@@ -68,7 +68,7 @@ class GradShapCVInterpreter(InputGradientInterpreter):
 
         imgs, data = images_transform_pipeline(inputs, resize_to, crop_to)
         bsz = len(data)
-        self.data_type = np.array(data).dtype
+        self.data_type = data.dtype
 
         self._build_predict_fn(gradient_of='probability')
 
@@ -71,7 +71,7 @@ class IntGradCVInterpreter(InputGradientInterpreter):
 
         imgs, data = images_transform_pipeline(inputs, resize_to, crop_to)
 
-        self.data_type = np.array(data).dtype
+        self.data_type = data.dtype
         self.input_type = type(data)
 
         self._build_predict_fn(gradient_of='probability')
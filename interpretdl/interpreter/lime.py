@@ -83,8 +83,6 @@ class LIMECVInterpreter(InputOutputInterpreter):
                 # for later visualization
                 img = restore_image(data.copy())
         data = preprocess_image(img)
-        data_type = np.array(data).dtype
-        self.data_type = data_type
 
         self._build_predict_fn(output='probability')
 
@@ -15,6 +15,10 @@ class RolloutInterpreter(IntermediateLayerInterpreter):
 
     More details regarding the Rollout method can be found in the original paper:
     https://arxiv.org/abs/2005.00928.
+
+    The attention-collecting hooks stay registered on ``paddle_model`` between :py:meth:`interpret` calls
+    (they are inactive outside them); call :py:meth:`close` to remove them once the interpreter is no
+    longer needed.
     """
 
     def __init__(self, paddle_model: callable, device: str = 'gpu:0', use_cuda=None) -> None:
@@ -16,6 +16,10 @@ class ScoreCAMInterpreter(IntermediateLayerInterpreter):
 
     More details regarding the Score CAM method can be found in the original paper:
     https://arxiv.org/abs/1910.01279.
+
+    The feature-collecting hooks stay registered on ``paddle_model`` between :py:meth:`interpret` calls
+    (they are inactive outside them); call :py:meth:`close` to remove them once the interpreter is no
+    longer needed.
     """
 
     def __init__(self, paddle_model: callable, device: str = 'gpu:0', use_cuda=None) -> None:
@@ -0,0 +1,65 @@
+import unittest
+import warnings
+from paddle.vision.models import mobilenet_v2
+import numpy as np
+from interpretdl.interpreter.abc_interpreter import InputGradientInterpreter
+from tests.utils import assert_arrays_almost_equal
+
+
+class TestBatchedPredictFn(unittest.TestCase):
+
+    def test_equals_predict_fn(self):
+        paddle_model = mobilenet_v2(pretrained=True)
+        algo = InputGradientInterpreter(paddle_model, device='cpu')
+        algo._build_predict_fn(gradient_of='loss')
+        algo._build_batched_predict_fn(gradient_of='loss')
+
+        np.random.seed(42)
+        data = np.random.randn(2, 3, 64, 64).astype(np.float32)
+        labels = np.array([0, 1])
+        n_reps = 3
+        tiled = np.tile(data, (n_reps, 1, 1, 1))
+
+        batched = algo.predict_fn_batched(tiled, labels, n_reps).numpy()
+        desired, _ = algo.predict_fn(tiled, np.tile(labels, n_reps))
+
+        assert_arrays_almost_equal(self, batched, desired)
+
+    def test_to_static_fallback(self):
+        import paddle
+
+        paddle_model = mobilenet_v2(pretrained=True)
+        algo = InputGradientInterpreter(paddle_model, device='cpu')
+
+        # force the compiled path to fail, so predict_fn_batched has to fall back to dygraph.
+        def fake_to_static(fn):
+            def compiled(*args, **kwargs):
+                raise RuntimeError('tracing failed')
+
+            return compiled
+
+        original_to_static = paddle.jit.to_static
+        paddle.jit.to_static = fake_to_static
+        try:
+            algo._build_batched_predict_fn(gradient_of='loss', to_static=True)
+        finally:
+            paddle.jit.to_static = original_to_static
+
+        np.random.seed(42)
+        data = np.random.randn(1, 3, 64, 64).astype(np.float32)
+        labels = np.array([0])
+        n_reps = 2
+        tiled = np.tile(data, (n_reps, 1, 1, 1))
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            batched = algo.predict_fn_batched(tiled, labels, n_reps).numpy()
+
+        self.assertTrue(any('dygraph' in str(w.message) for w in caught))
+
+        desired, _ = algo.predict_fn(tiled, np.tile(labels, n_reps))
+        assert_arrays_almost_equal(self, batched, desired)
+
+
+if __name__ == '__main__':
+    unittest.main()
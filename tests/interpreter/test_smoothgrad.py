@@ -3,6 +3,7 @@ from paddle.vision.models import mobilenet_v2
 import numpy as np
 import os
 import interpretdl as it
+from interpretdl.data_processor.readers import images_transform_pipeline
 from tests.utils import assert_arrays_almost_equal
 
 
@@ -37,11 +38,22 @@ class TestSG(unittest.TestCase):
         np.random.seed(42)
         img_path = np.random.randint(0, 255, size=(1, 64, 64, 3), dtype=np.uint8)
         algo = it.SmoothGradInterpreter(paddle_model, device='cpu')
-        exp = algo.interpret(img_path, n_samples=5, visual=False)
-        result = np.array([exp.mean(), exp.std(), exp.min(), exp.max()])
-        desired = np.array([ 5.1930110e-06,  4.0496187e-03, -2.3638349e-02,  3.2775488e-02])
+        algo._rng = np.random.default_rng(42)
+        n_samples = 5
+        exp = algo.interpret(img_path, n_samples=n_samples, visual=False)
 
-        assert_arrays_almost_equal(self, result, desired)
+        # the batched/chunked path must match the average of per-replica gradients computed on the
+        # same noised inputs.
+        _, data = images_transform_pipeline(img_path)
+        max_axis = tuple(np.arange(1, data.ndim))
+        stds = 0.1 * (np.max(data, axis=max_axis) - np.min(data, axis=max_axis))
+        stds_b = stds.reshape((1, len(data)) + (1, ) * (data.ndim - 1)).astype(np.float32)
+        noise = np.random.default_rng(42).standard_normal((n_samples, ) + data.shape, dtype=np.float32) * stds_b
+
+        gradients = [algo.predict_fn(data + noise[i], algo.labels)[0] for i in range(n_samples)]
+        desired = np.mean(gradients, axis=0)
+
+        assert_arrays_almost_equal(self, exp, desired)
 
     def test_shape_v2(self):
         paddle_model = mobilenet_v2(pretrained=True)